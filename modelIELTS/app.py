@@ -12,9 +12,17 @@ Run:
     uvicorn app:app --reload --host 0.0.0.0 --port 8000
 """
 
+import asyncio
+import functools
+import hashlib
 import os
 import logging
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from types import MappingProxyType
 from typing import Optional
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query
@@ -22,7 +30,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import torch
-import numpy as np
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
 # Configure logging
@@ -32,6 +39,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Whisper service - resolved once at import instead of per-request inside
+# handlers. Handlers only check the WHISPER_OK flag.
+try:
+    from services.speech_service import (
+        AudioValidationError,
+        get_whisper_info,
+        preload_model as preload_whisper_model,
+        transcribe_audio_file,
+        whisper_manager,
+    )
+    WHISPER_OK = True
+except ImportError as e:
+    logger.warning(f"⚠️ Whisper not available: {e}")
+    WHISPER_OK = False
+    AudioValidationError = Exception  # keeps except-clauses valid; unreachable without Whisper
+
+# Static Whisper configuration snapshot, taken once after preload in lifespan
+# so /health doesn't re-introspect the model object on every probe
+WHISPER_INFO: Optional[dict] = None
+
 # ======================== CONFIG ========================
 # Lấy đường dẫn gốc từ biến môi trường (mặc định /models cho Docker, hoặc "." cho local)
 BASE_MODEL_DIR = os.getenv("MODEL_DIR", ".")
@@ -40,86 +67,223 @@ BASE_MODEL_DIR = os.getenv("MODEL_DIR", ".")
 WRITING_MODEL_DIR = os.path.join(BASE_MODEL_DIR, "ielts-writing-v3-classification")  # Classification model (12 classes)
 SPEAKING_MODEL_DIR = os.path.join(BASE_MODEL_DIR, "speaking-cefr-roberta")  # New model trained on ICNALE + CEFR-Explorer
 ENABLE_WHISPER = True  # Set to False to disable Whisper (saves memory)
+QUANTIZE = os.getenv("QUANTIZE", "int8")  # "int8" = dynamic INT8 on CPU, "off" = FP32
+TORCH_COMPILE = os.getenv("TORCH_COMPILE", "0") == "1"  # TorchInductor for classifier forwards
+USE_ORT = os.getenv("USE_ORT", "0") == "1"  # ONNX Runtime classifiers (see export_onnx.py)
+
+# Dynamic batching: concurrent requests arriving within the window are
+# coalesced into one forward pass (amortizes kernel-launch overhead)
+MAX_BATCH = int(os.getenv("MAX_BATCH", "16"))
+BATCH_WINDOW_SECONDS = float(os.getenv("BATCH_WINDOW_MS", "10")) / 1000.0
+
+# Dedicated pool for the blocking model calls. Deliberately small: each
+# forward already parallelizes across BLAS/OMP threads, so more workers
+# would just oversubscribe the cores.
+CPU_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="inference")
 
 # Writing model band classes (for classification)
 WRITING_BAND_CLASSES = [3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0]
-WRITING_IDX_TO_BAND = {i: band for i, band in enumerate(WRITING_BAND_CLASSES)}
+# Tuple indexed by class id — cheaper than hashing ints through a dict
+WRITING_IDX_TO_BAND = tuple(WRITING_BAND_CLASSES)
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+# Mixed precision for the transformer forward passes: FP16 on GPU, BF16 on CPU.
+# CPU autocast is skipped when INT8 quantization is active (the quantized
+# Linear kernels already run reduced precision and do not autocast).
+AUTOCAST_DTYPE = torch.float16 if device.type == "cuda" else torch.bfloat16
+AUTOCAST_ENABLED = device.type == "cuda" or QUANTIZE != "int8"
+
 # Speaking constants
 CEFR_LABELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
-ID2LABEL = {i: lbl for i, lbl in enumerate(CEFR_LABELS)}
+ID2LABEL = tuple(CEFR_LABELS)
 CEFR_TO_IELTS = {
     "A1": 2.5, "A2": 3.5, "B1": 5.0,
     "B2": 6.5, "C1": 7.5, "C2": 8.5
 }
+# Band by class id — one tuple subscript instead of dict->string->dict
+CEFR_BAND_BY_ID = tuple(CEFR_TO_IELTS[lbl] for lbl in CEFR_LABELS)
 
 
-# ======================== MODEL MANAGERS (Best Practice: Lazy Loading) ========================
-class ModelManager:
-    """Singleton model manager for lazy loading and caching models."""
-    
-    _writing_model = None
-    _writing_tokenizer = None
-    _speaking_model = None
-    _speaking_tokenizer = None
-    _whisper_service = None
-    _speaking_available = None  # None = not checked, True/False = result
-    
-    @classmethod
-    def get_writing_model(cls):
-        if cls._writing_model is None:
-            logger.info("📚 Loading Writing Model...")
-            cls._writing_tokenizer = AutoTokenizer.from_pretrained(WRITING_MODEL_DIR)
-            cls._writing_model = AutoModelForSequenceClassification.from_pretrained(
-                WRITING_MODEL_DIR
-            ).to(device)
-            cls._writing_model.eval()
-            logger.info("✅ Writing Model loaded!")
-        return cls._writing_model, cls._writing_tokenizer
-    
-    @classmethod
-    def get_speaking_model(cls):
-        if cls._speaking_available is None:
-            # Check if model exists
-            cls._speaking_available = os.path.exists(SPEAKING_MODEL_DIR)
-        
-        if not cls._speaking_available:
-            raise FileNotFoundError(
-                f"Speaking model not found at '{SPEAKING_MODEL_DIR}'. "
-                f"Train it first using: python train_speaking_level.py"
+# ======================== QUANTIZATION ========================
+def maybe_quantize(model):
+    """
+    Apply INT8 dynamic quantization to Linear layers on CPU deployments.
+
+    RoBERTa-class models are memory-bandwidth-bound on CPU; INT8 weights
+    roughly halve memory and cut latency with negligible accuracy loss.
+    Embeddings and LayerNorm stay in FP32. No-op on GPU or when QUANTIZE=off.
+    """
+    if QUANTIZE != "int8" or device.type != "cpu":
+        return model
+    logger.info("⚡ Applying INT8 dynamic quantization (CPU)...")
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def maybe_compile(model):
+    """
+    Wrap the classifier with torch.compile when TORCH_COMPILE=1.
+
+    Inputs are dynamically padded, so sequence length varies per request;
+    dynamic=True tells TorchInductor to compile shape-polymorphic kernels
+    instead of recompiling per length. Pair with a warmup forward at
+    startup so the first real request does not pay compile cost.
+    """
+    if not TORCH_COMPILE or not hasattr(torch, "compile"):
+        return model
+    logger.info("🔧 Compiling model with TorchInductor (reduce-overhead)...")
+    return torch.compile(model, mode="reduce-overhead", fullgraph=False, dynamic=True)
+
+
+# Reusable pinned staging buffers for H2D copies. pin_memory() per call
+# re-registers pages with the driver every request; instead keep one
+# grow-only pinned buffer per tensor name. Thread-local because two
+# CPU_POOL workers may stage batches concurrently.
+_pinned_buffers = threading.local()
+
+
+def _pinned_slice(name, tensor):
+    """Return a pinned view of this thread's staging buffer sized to `tensor`."""
+    buffers = getattr(_pinned_buffers, "tensors", None)
+    if buffers is None:
+        buffers = _pinned_buffers.tensors = {}
+    rows, cols = tensor.shape
+    buf = buffers.get(name)
+    if buf is None or buf.shape[0] < rows or buf.shape[1] < cols:
+        buf = torch.empty(
+            (max(rows, buf.shape[0] if buf is not None else 0),
+             max(cols, buf.shape[1] if buf is not None else 0)),
+            dtype=tensor.dtype,
+            pin_memory=True,
+        )
+        buffers[name] = buf
+    staged = buf[:rows, :cols]
+    staged.copy_(tensor)
+    return staged
+
+
+def to_inference_device(enc):
+    """
+    Move a tokenizer BatchEncoding to the inference device.
+
+    On GPU, stage through reusable pinned buffers and copy non-blocking so
+    the H2D transfer overlaps with tokenization of the next request and no
+    pinned allocation happens per call. On CPU this is a no-op.
+    """
+    if device.type != "cuda":
+        return enc
+    return {
+        k: _pinned_slice(k, v).to(device, non_blocking=True)
+        for k, v in enc.items()
+    }
+
+
+def warmup_model(model, tokenizer, max_length: int):
+    """Run one dummy forward at the serving shape to trigger compile/autotune."""
+    enc = tokenizer(
+        "warmup",
+        return_tensors="pt",
+        truncation=True,
+        max_length=max_length,
+        padding="max_length",
+    )
+    enc = to_inference_device(enc)
+    with torch.inference_mode(), torch.autocast(
+        device_type=device.type, dtype=AUTOCAST_DTYPE, enabled=AUTOCAST_ENABLED
+    ):
+        model(**enc)
+    if device.type == "cuda":
+        torch.cuda.synchronize()  # make sure autotune finished before serving
+
+
+def load_classifier(model_dir: str):
+    """
+    Load a sequence classifier, preferring ONNX Runtime when USE_ORT=1.
+
+    The ORT path expects an export produced by export_onnx.py in
+    '<model_dir>-onnx' and picks the INT8-quantized graph when present.
+    ORTModelForSequenceClassification keeps the same .logits interface, so
+    the prediction code is identical. Falls back to eager PyTorch (with the
+    usual quantize/compile treatment) if ORT or the export is unavailable.
+    """
+    if USE_ORT:
+        onnx_dir = f"{model_dir}-onnx"
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+
+            file_name = "model.int8.onnx"
+            if not os.path.exists(os.path.join(onnx_dir, file_name)):
+                file_name = "model.onnx"
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.graph_optimization_level = (
+                onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
             )
-        
-        if cls._speaking_model is None:
-            logger.info("📚 Loading Speaking Model...")
-            cls._speaking_tokenizer = AutoTokenizer.from_pretrained(SPEAKING_MODEL_DIR)
-            cls._speaking_model = AutoModelForSequenceClassification.from_pretrained(
-                SPEAKING_MODEL_DIR
-            ).to(device)
-            cls._speaking_model.eval()
-            logger.info("✅ Speaking Model loaded!")
-        return cls._speaking_model, cls._speaking_tokenizer
-    
-    @classmethod
-    def is_speaking_available(cls):
-        if cls._speaking_available is None:
-            cls._speaking_available = os.path.exists(SPEAKING_MODEL_DIR)
-        return cls._speaking_available
-    
-    @classmethod
-    def get_whisper_service(cls):
-        if cls._whisper_service is None and ENABLE_WHISPER:
-            try:
-                from services.speech_service import whisper_manager, preload_model
-                logger.info("🎤 Loading Whisper Model...")
-                preload_model()
-                cls._whisper_service = whisper_manager
-                logger.info("✅ Whisper Model loaded!")
-            except ImportError as e:
-                logger.warning(f"⚠️ Whisper not available: {e}")
-                cls._whisper_service = None
-        return cls._whisper_service
+            session_options.enable_cpu_mem_arena = False
+
+            logger.info(f"📦 Loading ONNX Runtime model from {onnx_dir} ({file_name})...")
+            return ORTModelForSequenceClassification.from_pretrained(
+                onnx_dir,
+                file_name=file_name,
+                provider="CPUExecutionProvider",
+                session_options=session_options,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX Runtime unavailable ({e}), falling back to PyTorch")
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir).to(device)
+    model.eval()
+    model = maybe_quantize(model)
+    return maybe_compile(model)
+
+
+# ======================== MODEL LOADERS (Best Practice: Lazy Loading) ========================
+# functools.cache memoizes each loader so every call after the first is a
+# plain dict hit. Note it does NOT lock: concurrent first calls would each
+# run the load. lifespan primes the caches before traffic is accepted,
+# which is what actually guarantees a single load per process.
+@functools.cache
+def get_writing_model():
+    logger.info("📚 Loading Writing Model...")
+    tokenizer = AutoTokenizer.from_pretrained(WRITING_MODEL_DIR, use_fast=True)
+    tokenizer.model_max_length = 512  # pin explicitly; some configs ship a huge sentinel
+    model = load_classifier(WRITING_MODEL_DIR)
+    logger.info("✅ Writing Model loaded!")
+    return model, tokenizer
+
+
+@functools.cache
+def get_speaking_model():
+    if not is_speaking_available():
+        raise FileNotFoundError(
+            f"Speaking model not found at '{SPEAKING_MODEL_DIR}'. "
+            f"Train it first using: python train_speaking_level.py"
+        )
+
+    logger.info("📚 Loading Speaking Model...")
+    tokenizer = AutoTokenizer.from_pretrained(SPEAKING_MODEL_DIR, use_fast=True)
+    tokenizer.model_max_length = 128
+    model = load_classifier(SPEAKING_MODEL_DIR)
+    logger.info("✅ Speaking Model loaded!")
+    return model, tokenizer
+
+
+@functools.cache
+def is_speaking_available() -> bool:
+    return os.path.exists(SPEAKING_MODEL_DIR)
+
+
+@functools.cache
+def get_whisper_service():
+    if not ENABLE_WHISPER or not WHISPER_OK:
+        return None
+    logger.info("🎤 Loading Whisper Model...")
+    preload_whisper_model()
+    logger.info("✅ Whisper Model loaded!")
+    return whisper_manager
 
 
 # ======================== LIFESPAN (Best Practice: Startup/Shutdown) ========================
@@ -131,25 +295,43 @@ async def lifespan(app: FastAPI):
     """
     logger.info("🚀 Starting IELTS Scoring API...")
     logger.info(f"📊 Device: {device}")
+
+    # Cap intra-op threads so two concurrent forwards don't fight over cores
+    torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
     
-    # Preload models on startup
-    ModelManager.get_writing_model()
-    
+    # Preload models on startup and run one dummy forward each, so cuDNN
+    # autotune / compile / quantized-kernel prep happens before real traffic
+    writing_model, writing_tokenizer = get_writing_model()
+    warmup_model(writing_model, writing_tokenizer, max_length=512)
+
     # Speaking model (optional - may not exist)
-    if ModelManager.is_speaking_available():
-        ModelManager.get_speaking_model()
+    if is_speaking_available():
+        speaking_model, speaking_tokenizer = get_speaking_model()
+        warmup_model(speaking_model, speaking_tokenizer, max_length=128)
     else:
         logger.warning("⚠️ Speaking model not found. Train it using: python train_speaking_level.py")
     
     if ENABLE_WHISPER:
-        ModelManager.get_whisper_service()
-    
+        get_whisper_service()
+        if WHISPER_OK:
+            global WHISPER_INFO
+            WHISPER_INFO = get_whisper_info()
+
+    # Start the request batchers. The speaking batcher runs even without a
+    # model on disk: its worker surfaces the loader's FileNotFoundError to
+    # each submitted request (500, as before batching), whereas an unstarted
+    # batcher would leave submissions queued forever.
+    writing_batcher.start()
+    speaking_batcher.start()
+
     logger.info("✅ API ready! (Some models may be unavailable)")
-    
+
     yield  # Server is running
-    
+
     # Cleanup on shutdown
     logger.info("👋 Shutting down IELTS Scoring API...")
+    await writing_batcher.stop()
+    await speaking_batcher.stop()
 
 
 # ======================== FASTAPI APP ========================
@@ -244,138 +426,304 @@ class ErrorResponse(BaseModel):
     detail: str
 
 
+# ======================== PREDICTION CACHE ========================
+# Retried essays and demo traffic re-score identical texts; a cache hit
+# skips the transformer forward entirely — the expensive part of the API.
+PREDICTION_CACHE_SIZE = 256
+
+
+def text_cache_key(text: str) -> str:
+    """Fast non-cryptographic digest of the input text (blake2b, 8 bytes)."""
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+class PredictionCache:
+    """
+    Small thread-safe LRU mapping text-hash keys to prediction results.
+
+    get/put run from the CPU_POOL worker threads as well as run_in_executor
+    callers, so both take a lock. Stored values are shared by reference on
+    every hit — store only deep-immutable values (tuples / MappingProxyType)
+    so one caller can never poison the cache for the rest.
+    """
+
+    def __init__(self, maxsize: int = PREDICTION_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+_writing_cache = PredictionCache()
+_speaking_cache = PredictionCache()
+
+
 # ======================== PREDICTION FUNCTIONS ========================
-def predict_writing_band(essay: str) -> dict:
+def predict_writing_band_batch(essays: list[str]) -> list[dict]:
     """
-    Predict IELTS Writing band score using RoBERTa Classification model.
-    
+    Predict IELTS Writing band scores for a batch of essays in one forward.
+
+    Cached results are reused per essay; only cache misses reach the model.
+
     Model trained on IELTS Writing Task 2 essays dataset.
     Performance: 37.7% exact, 70.6% within ±0.5, 87.4% within ±1.0
-    
+
     Returns:
-        dict with 'band', 'confidence', and 'top_predictions'
+        list of dicts with 'band', 'confidence', and 'top_predictions'
     """
-    model, tokenizer = ModelManager.get_writing_model()
-    
+    keys = [text_cache_key(essay) for essay in essays]
+    results = [_writing_cache.get(key) for key in keys]
+    miss_positions = [i for i, result in enumerate(results) if result is None]
+    if not miss_positions:
+        return results
+
+    model, tokenizer = get_writing_model()
+
+    # Dynamic padding: pad only to the longest essay in the batch.
+    # Attention is O(n^2) — padding a 200-token essay to 512 wastes most
+    # of the matmul work. max_length stays as a truncation cap only.
     enc = tokenizer(
-        essay,
+        [essays[i] for i in miss_positions],
         return_tensors="pt",
         truncation=True,
         max_length=512,
-        padding="max_length",
-    ).to(device)
+        padding="longest",
+        # FP16 tensor cores hit the fast tile path only on multiple-of-8
+        # sequence lengths; a no-op on CPU
+        pad_to_multiple_of=8 if device.type == "cuda" else None,
+    )
+    enc = to_inference_device(enc)
 
-    with torch.no_grad():
+    with torch.inference_mode(), torch.autocast(
+        device_type=device.type, dtype=AUTOCAST_DTYPE, enabled=AUTOCAST_ENABLED
+    ):
         outputs = model(**enc)
-        logits = outputs.logits.detach().cpu().numpy()[0]
-        
-        # Apply softmax for probabilities
-        exp_logits = np.exp(logits - np.max(logits))
-        probs = exp_logits / exp_logits.sum()
-        
-        # Get predicted class
-        pred_idx = int(np.argmax(probs))
-        confidence = float(probs[pred_idx])
-        
-        # Get top 3 predictions
-        top_indices = np.argsort(probs)[::-1][:3]
-        top_predictions = [
-            {"band": WRITING_IDX_TO_BAND[idx], "probability": float(probs[idx])}
-            for idx in top_indices
-        ]
-    
-    return {
-        "band": WRITING_IDX_TO_BAND[pred_idx],
-        "confidence": confidence,
-        "top_predictions": top_predictions
-    }
+        logits = outputs.logits
+        # Select top-3 on raw logits, then normalize just those entries:
+        # softmax(x)_i == exp(x_i - logsumexp(x)), so this is the exact
+        # full-distribution probability without materializing a 12-way
+        # softmax tensor. Single D2H copy via .tolist().
+        top_logits, top_indices = torch.topk(logits, 3, dim=-1)
+        top_probs = torch.exp(
+            top_logits - torch.logsumexp(logits, dim=-1, keepdim=True)
+        )
+        top_probs = top_probs.tolist()
+        top_indices = top_indices.tolist()
+
+    for position, indices, probs_row in zip(miss_positions, top_indices, top_probs):
+        # Deep-immutable so the cached value is safe to hand out by reference
+        result = MappingProxyType({
+            "band": WRITING_IDX_TO_BAND[indices[0]],
+            "confidence": float(probs_row[0]),
+            "top_predictions": tuple(
+                MappingProxyType(
+                    {"band": WRITING_IDX_TO_BAND[idx], "probability": float(prob)}
+                )
+                for idx, prob in zip(indices, probs_row)
+            ),
+        })
+        _writing_cache.put(keys[position], result)
+        results[position] = result
+    return results
 
 
-def predict_cefr_and_band(text: str) -> tuple[str, float]:
-    """Predict CEFR level (A1-C2) and approximate IELTS Speaking band"""
-    model, tokenizer = ModelManager.get_speaking_model()
-    
+def predict_writing_band(essay: str) -> dict:
+    """Predict IELTS Writing band score for a single essay."""
+    return predict_writing_band_batch([essay])[0]
+
+
+def predict_cefr_and_band_batch(texts: list[str]) -> list[tuple[str, float]]:
+    """
+    Predict CEFR levels and approximate IELTS Speaking bands for a batch.
+
+    Cached results are reused per text; only cache misses reach the model.
+    """
+    keys = [text_cache_key(text) for text in texts]
+    results = [_speaking_cache.get(key) for key in keys]
+    miss_positions = [i for i, result in enumerate(results) if result is None]
+    if not miss_positions:
+        return results
+
+    model, tokenizer = get_speaking_model()
+
     enc = tokenizer(
-        text,
+        [texts[i] for i in miss_positions],
         return_tensors="pt",
         truncation=True,
         max_length=128,
-        padding="max_length",
-    ).to(device)
+        padding="longest",
+        pad_to_multiple_of=8 if device.type == "cuda" else None,
+    )
+    enc = to_inference_device(enc)
 
-    with torch.no_grad():
+    with torch.inference_mode(), torch.autocast(
+        device_type=device.type, dtype=AUTOCAST_DTYPE, enabled=AUTOCAST_ENABLED
+    ):
         outputs = model(**enc)
-        logits = outputs.logits.detach().cpu().numpy()
-        pred_id = int(np.argmax(logits, axis=-1)[0])
+        pred_ids = torch.argmax(outputs.logits, dim=-1).tolist()
+
+    for position, pred_id in zip(miss_positions, pred_ids):
+        result = (ID2LABEL[pred_id], CEFR_BAND_BY_ID[pred_id])
+        _speaking_cache.put(keys[position], result)
+        results[position] = result
+    return results
+
+
+def predict_cefr_and_band(text: str) -> tuple[str, float]:
+    """Predict CEFR level (A1-C2) and approximate IELTS Speaking band"""
+    return predict_cefr_and_band_batch([text])[0]
+
+
+# ======================== DYNAMIC BATCHING ========================
+class MicroBatcher:
+    """
+    Coalesce concurrent single-text requests into one batched forward pass.
+
+    Requests arriving within BATCH_WINDOW_SECONDS of each other are drained
+    into a single tokenized batch (up to MAX_BATCH) and run through one
+    model(**enc) call; results fan back out through per-request futures.
+    """
+
+    def __init__(self, predict_batch, max_batch: int = MAX_BATCH,
+                 window: float = BATCH_WINDOW_SECONDS):
+        self._predict_batch = predict_batch
+        self._max_batch = max_batch
+        self._window = window
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, text: str):
+        """Submit one text for scoring; resolves when its batch completes."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _worker(self) -> None:
+        while True:
+            # Block for the first request, then drain for one batch window
+            batch = [await self._queue.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=self._window)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    CPU_POOL, self._predict_batch, texts
+                )
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
 
-    cefr = ID2LABEL[pred_id]
-    band = CEFR_TO_IELTS.get(cefr, 0.0)
-    return cefr, band
+writing_batcher = MicroBatcher(predict_writing_band_batch)
+speaking_batcher = MicroBatcher(predict_cefr_and_band_batch)
 
 
 # ======================== FEEDBACK BUILDERS ========================
+# Feedback texts are fixed per band bucket, so build the dicts once at
+# import time and return (read-only) references instead of reconstructing
+# string-heavy dict literals on every request. Lookup is a single bisect
+# over the bucket cutoffs.
+_WRITING_FEEDBACK_CUTOFFS = (5.0, 5.5, 6.5, 7.5)
+_WRITING_FEEDBACKS = tuple(MappingProxyType(fb) for fb in (
+    {
+        "task_response": "Bài viết chưa trả lời đầy đủ yêu cầu đề bài. Hãy tập trung hiểu rõ câu hỏi và đưa ra các ý chính liên quan.",
+        "coherence_cohesion": "Cấu trúc bài cần cải thiện. Sử dụng các đoạn văn rõ ràng với câu chủ đề và từ nối.",
+        "vocabulary": "Vốn từ vựng còn hạn chế. Cần học thêm từ vựng theo chủ đề và các cụm từ cố định (collocations).",
+        "grammar": "Nhiều lỗi ngữ pháp ảnh hưởng đến ý nghĩa. Cần luyện tập các cấu trúc câu cơ bản và các thì phổ biến."
+    },
+    {
+        "task_response": "Bài viết đã đề cập đến yêu cầu đề nhưng chưa đầy đủ. Hãy mở rộng ý tưởng với các ví dụ cụ thể và chi tiết hơn.",
+        "coherence_cohesion": "Cấu trúc bài cần cải thiện. Mỗi đoạn văn cần có câu chủ đề rõ ràng và các câu hỗ trợ. Sử dụng đa dạng hơn các từ nối như 'furthermore', 'however', 'consequently'.",
+        "vocabulary": "Vốn từ cơ bản, có xu hướng lặp lại. Hãy học thêm synonyms và các cụm từ học thuật như 'it is widely believed that', 'there is a growing concern about'.",
+        "grammar": "Lỗi ngữ pháp xuất hiện khá thường xuyên. Cần chú ý đến subject-verb agreement, article usage, và các thì động từ."
+    },
+    {
+        "task_response": "Bạn đã trả lời được yêu cầu đề bài nhưng một số điểm có thể phát triển thêm với ví dụ cụ thể hơn.",
+        "coherence_cohesion": "Bài viết có tổ chức hợp lý nhưng có thể cải thiện cách chia đoạn. Sử dụng đa dạng hơn các từ nối và tránh lặp lại 'firstly, secondly, thirdly'.",
+        "vocabulary": "Vốn từ đủ dùng cho bài viết. Hãy thử dùng từ ngữ phức tạp hơn như collocations và idiomatic expressions.",
+        "grammar": "Ngữ pháp khá tốt với một số lỗi nhỏ. Cần luyện thêm các cấu trúc câu phức tạp như relative clauses, conditionals, và passive voice."
+    },
+    {
+        "task_response": "Bài viết phát triển tốt với quan điểm rõ ràng và các ý tưởng mở rộng, liên quan. Để đạt band cao hơn, cần có phân tích sâu sắc hơn.",
+        "coherence_cohesion": "Tổ chức logic với việc sử dụng hiệu quả các phương tiện liên kết. Có thể cải thiện bằng cách sử dụng referencing pronouns và lexical cohesion.",
+        "vocabulary": "Vốn từ phong phú và đa dạng. Tiếp tục mở rộng academic vocabulary và less common lexical items.",
+        "grammar": "Sử dụng đa dạng cấu trúc ngữ pháp với độ chính xác cao. Có thể thử thêm inversions và cleft sentences."
+    },
+    {
+        "task_response": "Bài viết xuất sắc với phân tích sâu sắc và lập luận chặt chẽ. Ý tưởng được phát triển đầy đủ và có tính thuyết phục.",
+        "coherence_cohesion": "Tổ chức hoàn hảo với sự chuyển tiếp mượt mà giữa các ý. Sử dụng thành thạo các phương tiện liên kết.",
+        "vocabulary": "Vốn từ phong phú, chính xác và tự nhiên. Sử dụng thành thạo idioms, collocations và academic vocabulary.",
+        "grammar": "Sử dụng đa dạng và linh hoạt các cấu trúc ngữ pháp phức tạp với độ chính xác gần như hoàn hảo."
+    },
+))
+
+_SPEAKING_FEEDBACK_CUTOFFS = (5.0, 6.5)
+_SPEAKING_FEEDBACKS = tuple(MappingProxyType(fb) for fb in (
+    {
+        "fluency_coherence": "Tốc độ nói còn chậm với nhiều lần dừng. Hãy luyện nói liên tục hơn về các chủ đề quen thuộc.",
+        "vocabulary": "Vốn từ còn hạn chế. Cần học thêm các cụm diễn đạt hàng ngày và từ vựng theo chủ đề.",
+        "grammar": "Còn nhiều lỗi ngữ pháp cơ bản. Tập trung luyện các thì hiện tại, quá khứ và tương lai đơn.",
+        "pronunciation": "Phát âm có thể gây khó hiểu cho người nghe. Luyện tập phát âm từng âm và trọng âm từ."
+    },
+    {
+        "fluency_coherence": "Bạn có thể duy trì bài nói về chủ đề quen thuộc với một chút do dự. Sử dụng thêm các từ nối.",
+        "vocabulary": "Vốn từ tốt cho các chủ đề quen thuộc. Mở rộng thêm các cụm diễn đạt và collocations.",
+        "grammar": "Kiểm soát tốt các cấu trúc đơn giản. Luyện thêm câu phức và câu điều kiện.",
+        "pronunciation": "Phát âm khá rõ ràng. Cần cải thiện ngữ điệu và cách nối âm."
+    },
+    {
+        "fluency_coherence": "Bạn nói trôi chảy, chỉ thỉnh thoảng do dự. Sử dụng tuyệt vời các từ nối.",
+        "vocabulary": "Vốn từ phong phú với việc sử dụng tốt thành ngữ và collocations.",
+        "grammar": "Kiểm soát nhất quán các cấu trúc phức tạp, chỉ thỉnh thoảng có lỗi nhỏ.",
+        "pronunciation": "Phát âm rõ ràng, tự nhiên với việc kiểm soát tốt trọng âm và ngữ điệu."
+    },
+))
+
+
 def build_writing_feedback(band: float) -> dict:
     """Generate rule-based feedback for Writing based on band score"""
-    if band < 5.0:
-        return {
-            "task_response": "Bài viết chưa trả lời đầy đủ yêu cầu đề bài. Hãy tập trung hiểu rõ câu hỏi và đưa ra các ý chính liên quan.",
-            "coherence_cohesion": "Cấu trúc bài cần cải thiện. Sử dụng các đoạn văn rõ ràng với câu chủ đề và từ nối.",
-            "vocabulary": "Vốn từ vựng còn hạn chế. Cần học thêm từ vựng theo chủ đề và các cụm từ cố định (collocations).",
-            "grammar": "Nhiều lỗi ngữ pháp ảnh hưởng đến ý nghĩa. Cần luyện tập các cấu trúc câu cơ bản và các thì phổ biến."
-        }
-    elif band < 5.5:
-        return {
-            "task_response": "Bài viết đã đề cập đến yêu cầu đề nhưng chưa đầy đủ. Hãy mở rộng ý tưởng với các ví dụ cụ thể và chi tiết hơn.",
-            "coherence_cohesion": "Cấu trúc bài cần cải thiện. Mỗi đoạn văn cần có câu chủ đề rõ ràng và các câu hỗ trợ. Sử dụng đa dạng hơn các từ nối như 'furthermore', 'however', 'consequently'.",
-            "vocabulary": "Vốn từ cơ bản, có xu hướng lặp lại. Hãy học thêm synonyms và các cụm từ học thuật như 'it is widely believed that', 'there is a growing concern about'.",
-            "grammar": "Lỗi ngữ pháp xuất hiện khá thường xuyên. Cần chú ý đến subject-verb agreement, article usage, và các thì động từ."
-        }
-    elif band < 6.5:
-        return {
-            "task_response": "Bạn đã trả lời được yêu cầu đề bài nhưng một số điểm có thể phát triển thêm với ví dụ cụ thể hơn.",
-            "coherence_cohesion": "Bài viết có tổ chức hợp lý nhưng có thể cải thiện cách chia đoạn. Sử dụng đa dạng hơn các từ nối và tránh lặp lại 'firstly, secondly, thirdly'.",
-            "vocabulary": "Vốn từ đủ dùng cho bài viết. Hãy thử dùng từ ngữ phức tạp hơn như collocations và idiomatic expressions.",
-            "grammar": "Ngữ pháp khá tốt với một số lỗi nhỏ. Cần luyện thêm các cấu trúc câu phức tạp như relative clauses, conditionals, và passive voice."
-        }
-    elif band < 7.5:
-        return {
-            "task_response": "Bài viết phát triển tốt với quan điểm rõ ràng và các ý tưởng mở rộng, liên quan. Để đạt band cao hơn, cần có phân tích sâu sắc hơn.",
-            "coherence_cohesion": "Tổ chức logic với việc sử dụng hiệu quả các phương tiện liên kết. Có thể cải thiện bằng cách sử dụng referencing pronouns và lexical cohesion.",
-            "vocabulary": "Vốn từ phong phú và đa dạng. Tiếp tục mở rộng academic vocabulary và less common lexical items.",
-            "grammar": "Sử dụng đa dạng cấu trúc ngữ pháp với độ chính xác cao. Có thể thử thêm inversions và cleft sentences."
-        }
-    else:
-        return {
-            "task_response": "Bài viết xuất sắc với phân tích sâu sắc và lập luận chặt chẽ. Ý tưởng được phát triển đầy đủ và có tính thuyết phục.",
-            "coherence_cohesion": "Tổ chức hoàn hảo với sự chuyển tiếp mượt mà giữa các ý. Sử dụng thành thạo các phương tiện liên kết.",
-            "vocabulary": "Vốn từ phong phú, chính xác và tự nhiên. Sử dụng thành thạo idioms, collocations và academic vocabulary.",
-            "grammar": "Sử dụng đa dạng và linh hoạt các cấu trúc ngữ pháp phức tạp với độ chính xác gần như hoàn hảo."
-        }
+    return _WRITING_FEEDBACKS[bisect_right(_WRITING_FEEDBACK_CUTOFFS, band)]
 
 
 def build_speaking_feedback(cefr: str, band: float) -> dict:
     """Generate rule-based feedback for Speaking based on CEFR level and band"""
-    if band < 5.0:
-        return {
-            "fluency_coherence": "Tốc độ nói còn chậm với nhiều lần dừng. Hãy luyện nói liên tục hơn về các chủ đề quen thuộc.",
-            "vocabulary": "Vốn từ còn hạn chế. Cần học thêm các cụm diễn đạt hàng ngày và từ vựng theo chủ đề.",
-            "grammar": "Còn nhiều lỗi ngữ pháp cơ bản. Tập trung luyện các thì hiện tại, quá khứ và tương lai đơn.",
-            "pronunciation": "Phát âm có thể gây khó hiểu cho người nghe. Luyện tập phát âm từng âm và trọng âm từ."
-        }
-    elif band < 6.5:
-        return {
-            "fluency_coherence": "Bạn có thể duy trì bài nói về chủ đề quen thuộc với một chút do dự. Sử dụng thêm các từ nối.",
-            "vocabulary": "Vốn từ tốt cho các chủ đề quen thuộc. Mở rộng thêm các cụm diễn đạt và collocations.",
-            "grammar": "Kiểm soát tốt các cấu trúc đơn giản. Luyện thêm câu phức và câu điều kiện.",
-            "pronunciation": "Phát âm khá rõ ràng. Cần cải thiện ngữ điệu và cách nối âm."
-        }
-    else:
-        return {
-            "fluency_coherence": "Bạn nói trôi chảy, chỉ thỉnh thoảng do dự. Sử dụng tuyệt vời các từ nối.",
-            "vocabulary": "Vốn từ phong phú với việc sử dụng tốt thành ngữ và collocations.",
-            "grammar": "Kiểm soát nhất quán các cấu trúc phức tạp, chỉ thỉnh thoảng có lỗi nhỏ.",
-            "pronunciation": "Phát âm rõ ràng, tự nhiên với việc kiểm soát tốt trọng âm và ngữ điệu."
-        }
+    return _SPEAKING_FEEDBACKS[bisect_right(_SPEAKING_FEEDBACK_CUTOFFS, band)]
 
 
 # ======================== EXCEPTION HANDLERS ========================
@@ -411,13 +759,13 @@ def root():
 def health():
     """Detailed health check with model status"""
     whisper_status = False
-    if ENABLE_WHISPER:
-        try:
-            from services.speech_service import get_whisper_info
-            whisper_info = get_whisper_info()
-            whisper_status = True
-        except:
-            whisper_info = {"error": "Whisper not available"}
+    if ENABLE_WHISPER and WHISPER_OK:
+        # Serve the startup snapshot; fall back to a live read only if the
+        # lifespan hook has not run (e.g. test client without lifespan)
+        whisper_info = WHISPER_INFO if WHISPER_INFO is not None else get_whisper_info()
+        whisper_status = True
+    elif ENABLE_WHISPER:
+        whisper_info = {"error": "Whisper not available"}
     else:
         whisper_info = {"enabled": False}
     
@@ -441,31 +789,32 @@ def health():
     summary="Score IELTS Writing Task 2",
     responses={400: {"model": ErrorResponse}}
 )
-def score_writing(req: WritingRequest):
+async def score_writing(req: WritingRequest):
     """
     Score an IELTS Writing Task 2 essay.
-    
+
     - **prompt**: (optional) The essay question
     - **essay**: The essay text (min 50 characters)
-    
+
     Returns:
     - **overall_band**: Band score from 3.5 to 9.0
     - **confidence**: Model confidence in prediction
     - **feedback**: Feedback for Task Response, Coherence, Vocabulary, Grammar
-    
+
     Model Performance:
     - Exact match: 37.7%
     - Within ±0.5: 70.6%
     - Within ±1.0: 87.4%
     """
     try:
-        result = predict_writing_band(req.essay)
+        result = await writing_batcher.submit(req.essay)
         band = result["band"]
         feedback = build_writing_feedback(band)
         return {
             "overall_band": band,
             "confidence": result["confidence"],
-            "top_predictions": result["top_predictions"],
+            # copy out of the shared cache entry into plain JSON types
+            "top_predictions": [dict(p) for p in result["top_predictions"]],
             "feedback": feedback
         }
     except Exception as e:
@@ -480,19 +829,19 @@ def score_writing(req: WritingRequest):
     tags=["Speaking"],
     summary="Score Speaking from transcript"
 )
-def score_speaking_text(req: SpeakingTextRequest):
+async def score_speaking_text(req: SpeakingTextRequest):
     """
     Score IELTS Speaking from text transcript.
-    
+
     - **answer_text**: The speaking answer transcript
-    
+
     Returns:
     - **cefr_level**: CEFR level (A1-C2)
     - **approx_ielts_band**: Approximate IELTS band
     - **feedback**: Feedback for Fluency, Vocabulary, Grammar, Pronunciation
     """
     try:
-        cefr, band = predict_cefr_and_band(req.answer_text)
+        cefr, band = await speaking_batcher.submit(req.answer_text)
         feedback = build_speaking_feedback(cefr, band)
         return {
             "cefr_level": cefr,
@@ -529,28 +878,19 @@ async def score_speaking_audio(
     **Max file size**: 25MB  
     **Max duration**: 5 minutes
     """
-    if not ENABLE_WHISPER:
+    if not ENABLE_WHISPER or not WHISPER_OK:
         raise HTTPException(
             status_code=503,
             detail="Speech-to-text is disabled. Set ENABLE_WHISPER=True to enable."
         )
-    
+
     try:
-        from services.speech_service import (
-            transcribe_audio_bytes,
-            AudioValidationError
-        )
-        
-        # Read audio file
-        audio_bytes = await audio.read()
-        
-        if len(audio_bytes) == 0:
-            raise HTTPException(status_code=400, detail="Empty audio file")
-        
-        # Transcribe
-        result = await transcribe_audio_bytes(
-            audio_bytes=audio_bytes,
-            filename=audio.filename or "audio.wav",
+        # Stream the upload straight from the framework's spool — no full
+        # bytes buffer in RAM. Transcription runs off the event loop.
+        result = await asyncio.to_thread(
+            transcribe_audio_file,
+            audio.file,
+            audio.filename or "audio.wav",
             language=language,
             include_segments=False
         )
@@ -563,8 +903,10 @@ async def score_speaking_audio(
                 detail="Could not extract meaningful text from audio. Please ensure clear speech."
             )
         
-        # Score the transcript
-        cefr, band = predict_cefr_and_band(transcript)
+        # Score the transcript (off the event loop, on the inference pool)
+        cefr, band = await asyncio.get_running_loop().run_in_executor(
+            CPU_POOL, predict_cefr_and_band, transcript
+        )
         feedback = build_speaking_feedback(cefr, band)
         
         return {
@@ -611,23 +953,17 @@ async def transcribe_audio(
     **Max file size**: 25MB  
     **Max duration**: 5 minutes
     """
-    if not ENABLE_WHISPER:
+    if not ENABLE_WHISPER or not WHISPER_OK:
         raise HTTPException(
             status_code=503,
             detail="Speech-to-text is disabled"
         )
-    
+
     try:
-        from services.speech_service import (
-            transcribe_audio_bytes,
-            AudioValidationError
-        )
-        
-        audio_bytes = await audio.read()
-        
-        result = await transcribe_audio_bytes(
-            audio_bytes=audio_bytes,
-            filename=audio.filename or "audio.wav",
+        result = await asyncio.to_thread(
+            transcribe_audio_file,
+            audio.file,
+            audio.filename or "audio.wav",
             language=language
         )
         
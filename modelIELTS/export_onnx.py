@@ -0,0 +1,62 @@
+"""
+ONNX Export Script
+==================
+Export the Writing and Speaking classifiers to ONNX and produce INT8
+dynamically-quantized variants for CPU deployment.
+
+ONNX Runtime with graph optimizations + INT8 Linear/MatMul typically beats
+PyTorch CPU inference by 2-4x on RoBERTa-class models.
+
+Run once (writes <model-dir>-onnx next to each model directory):
+    python export_onnx.py
+
+Then serve with:
+    USE_ORT=1 uvicorn app:app --host 0.0.0.0 --port 8000
+"""
+
+import os
+
+from optimum.onnxruntime import ORTModelForSequenceClassification
+from onnxruntime.quantization import quantize_dynamic, QuantType
+from transformers import AutoTokenizer
+
+BASE_MODEL_DIR = os.getenv("MODEL_DIR", ".")
+
+MODEL_DIRS = [
+    os.path.join(BASE_MODEL_DIR, "ielts-writing-v3-classification"),
+    os.path.join(BASE_MODEL_DIR, "speaking-cefr-roberta"),
+]
+
+
+def export_model(model_dir: str) -> None:
+    """Export one classifier to ONNX and add an INT8-quantized copy."""
+    if not os.path.exists(model_dir):
+        print(f"⚠️ Skipping {model_dir} (not found)")
+        return
+
+    onnx_dir = f"{model_dir}-onnx"
+    print(f"📦 Exporting {model_dir} -> {onnx_dir} ...")
+
+    model = ORTModelForSequenceClassification.from_pretrained(model_dir, export=True)
+    model.save_pretrained(onnx_dir)
+
+    # Tokenizer files live alongside the ONNX graph so the serving side
+    # can load everything from one directory
+    AutoTokenizer.from_pretrained(model_dir, use_fast=True).save_pretrained(onnx_dir)
+
+    print("⚡ Quantizing Linear/MatMul weights to INT8 ...")
+    quantize_dynamic(
+        os.path.join(onnx_dir, "model.onnx"),
+        os.path.join(onnx_dir, "model.int8.onnx"),
+        weight_type=QuantType.QInt8,
+    )
+    print(f"✅ Done: {onnx_dir}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🚀 ONNX Export for IELTS Scoring Models")
+    print("=" * 60)
+    for model_dir in MODEL_DIRS:
+        export_model(model_dir)
+    print("\n✅ All exports finished. Serve with USE_ORT=1")
@@ -0,0 +1,97 @@
+"""
+Static INT8 Quantization for the Writing Band Predictor
+=======================================================
+Quantize the exported Writing ONNX model with static INT8 (AVX512-VNNI,
+per-channel) using a small calibration set of essays.
+
+Static quantization dispatches the transformer matmuls to VNNI int8
+dot-product instructions on Ice Lake+ Xeons — typically 3-4x CPU
+throughput over FP32. Run export_onnx.py first, then:
+
+    python quantize_writing.py [calibration_essays.txt]
+
+The calibration file holds one essay per line; without it a small
+built-in sample is used (fine for smoke tests, use real essays for
+production accuracy). The quantized graph is written as
+model_quantized.onnx inside the ONNX export directory, which
+writing_service picks up automatically under USE_ORT=1.
+"""
+
+import os
+import sys
+
+from datasets import Dataset
+from optimum.onnxruntime import ORTQuantizer
+from optimum.onnxruntime.configuration import AutoCalibrationConfig, AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+BASE_MODEL_DIR = os.getenv("MODEL_DIR", ".")
+MODEL_DIR = os.path.join(BASE_MODEL_DIR, "ielts-writing-v3-classification")
+ONNX_DIR = f"{MODEL_DIR}-onnx"
+
+# Minimal fallback so the script runs without a calibration file
+FALLBACK_ESSAYS = [
+    "In today's competitive world, many individuals prioritise their careers, "
+    "often spending long hours at work to gain promotions or higher salaries. "
+    "While career success is undeniably important, I believe that maintaining "
+    "strong relationships with family and friends is equally essential.",
+    "Some people believe technology has made our lives more complicated. "
+    "Although devices demand attention and constant updates, on balance they "
+    "have simplified communication, travel, and access to information, so I "
+    "largely disagree with this view.",
+    "It is sometimes argued that governments should invest more in public "
+    "transport than in building new roads. This essay will examine both "
+    "approaches before concluding that a combination offers the best outcome "
+    "for growing cities.",
+]
+
+
+def load_calibration_texts(path: str = None) -> list:
+    """Load calibration essays (one per line), falling back to samples."""
+    if path and os.path.exists(path):
+        with open(path) as f:
+            texts = [line.strip() for line in f if line.strip()]
+        if texts:
+            print(f"📖 Calibrating with {len(texts)} essays from {path}")
+            return texts
+    print("📖 Calibrating with built-in sample essays (pass a file for production)")
+    return FALLBACK_ESSAYS
+
+
+def main() -> None:
+    if not os.path.exists(ONNX_DIR):
+        raise SystemExit(f"❌ {ONNX_DIR} not found — run export_onnx.py first")
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR, use_fast=True)
+    texts = load_calibration_texts(sys.argv[1] if len(sys.argv) > 1 else None)
+
+    def preprocess(examples):
+        return tokenizer(
+            examples["text"], truncation=True, max_length=512, padding="max_length"
+        )
+
+    dataset = Dataset.from_dict({"text": texts}).map(preprocess, remove_columns=["text"])
+
+    # export_onnx.py leaves both model.onnx and model.int8.onnx in the
+    # directory; name the FP32 graph explicitly or optimum refuses to pick
+    quantizer = ORTQuantizer.from_pretrained(ONNX_DIR, file_name="model.onnx")
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=True, per_channel=True)
+
+    print("📐 Fitting calibration ranges (minmax)...")
+    ranges = quantizer.fit(
+        dataset=dataset,
+        calibration_config=AutoCalibrationConfig.minmax(dataset),
+        operators_to_quantize=qconfig.operators_to_quantize,
+    )
+
+    print("⚡ Writing static INT8 graph...")
+    quantizer.quantize(
+        save_dir=ONNX_DIR,
+        quantization_config=qconfig,
+        calibration_tensors_range=ranges,
+    )
+    print(f"✅ Done: {os.path.join(ONNX_DIR, 'model_quantized.onnx')}")
+
+
+if __name__ == "__main__":
+    main()
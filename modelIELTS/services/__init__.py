@@ -5,23 +5,39 @@ This package provides scoring services for IELTS Writing and Speaking.
 """
 
 # Writing service - always available
-from .writing_service import predict_writing_band, build_writing_feedback, score_writing
+from .writing_service import (
+    predict_writing_band,
+    predict_writing_band_batch,
+    build_writing_feedback,
+    score_writing,
+    score_writing_batch,
+    preload_model as preload_writing_model,
+)
 
 # Speaking service - lazy loaded (model may not exist)
 try:
-    from .speaking_service import predict_cefr_and_band, build_speaking_feedback, score_speaking
+    from .speaking_service import (
+        predict_cefr_and_band,
+        predict_cefr_and_band_batch,
+        build_speaking_feedback,
+        score_speaking,
+        preload_model as preload_speaking_model,
+    )
     SPEAKING_AVAILABLE = True
 except FileNotFoundError:
     SPEAKING_AVAILABLE = False
     predict_cefr_and_band = None
+    predict_cefr_and_band_batch = None
     build_speaking_feedback = None
     score_speaking = None
+    preload_speaking_model = None
 
 # Speech-to-text (optional, requires whisper)
 try:
     from .speech_service import (
         transcribe_audio,
         transcribe_audio_bytes,
+        transcribe_audio_file,
         get_whisper_info,
         preload_model,
         AudioValidationError,
@@ -33,6 +49,7 @@ except ImportError:
     WHISPER_AVAILABLE = False
     transcribe_audio = None
     transcribe_audio_bytes = None
+    transcribe_audio_file = None
     get_whisper_info = None
     preload_model = None
     AudioValidationError = None
@@ -42,16 +59,22 @@ except ImportError:
 __all__ = [
     # Writing
     "predict_writing_band",
-    "build_writing_feedback", 
+    "predict_writing_band_batch",
+    "build_writing_feedback",
     "score_writing",
+    "score_writing_batch",
+    "preload_writing_model",
     # Speaking
     "predict_cefr_and_band",
+    "predict_cefr_and_band_batch",
     "build_speaking_feedback",
     "score_speaking",
+    "preload_speaking_model",
     "SPEAKING_AVAILABLE",
     # Speech-to-text
     "transcribe_audio",
     "transcribe_audio_bytes",
+    "transcribe_audio_file",
     "get_whisper_info",
     "preload_model",
     "AudioValidationError",
@@ -11,17 +11,31 @@ NOTE: Model is loaded lazily on first use.
       Train the model first using train_speaking_level.py
 """
 
+import hashlib
 import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from types import MappingProxyType, SimpleNamespace
+
 import torch
-import numpy as np
 
 MODEL_DIR = "./speaking-cefr-roberta"
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+# ONNX Runtime serving (optional): run export_onnx.py once, then set USE_ORT=1
+USE_ORT = os.getenv("USE_ORT", "0") == "1"
+# INT8 dynamic quantization of Linear weights on CPU ("off" keeps FP32)
+QUANTIZE = os.getenv("QUANTIZE", "int8")
+# TorchScript trace + freeze for the eager PyTorch path (set TORCH_JIT=1)
+TORCH_JIT = os.getenv("TORCH_JIT", "0") == "1"
+# torch.compile (inductor) for the eager PyTorch path (set TORCH_COMPILE=1)
+TORCH_COMPILE = os.getenv("TORCH_COMPILE", "0") == "1"
+
 # CEFR labels and mapping
 CEFR_LABELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
-ID2LABEL = {i: lbl for i, lbl in enumerate(CEFR_LABELS)}
+ID2LABEL = tuple(CEFR_LABELS)  # index-aligned: class id -> label
 CEFR_TO_IELTS = {
     "A1": 2.5,
     "A2": 3.5,
@@ -30,11 +44,131 @@ CEFR_TO_IELTS = {
     "C1": 7.5,
     "C2": 8.5,
 }
+# class id -> band directly, skipping the label-keyed dict on the hot path
+CEFR_BAND_BY_ID = tuple(CEFR_TO_IELTS[lbl] for lbl in CEFR_LABELS)
 
 # Lazy loading - model and tokenizer
 _model = None
 _tokenizer = None
 
+# Prediction cache: demo/QA traffic re-scores identical transcripts, and a
+# hit skips the transformer forward entirely. The cache stores the logits
+# row, so every derived view (argmax, softmax) is served from one entry.
+# get/put take a lock so threaded servers can share the cache; cached
+# tensors are treated as read-only by all derivations.
+_CACHE_MAX_ENTRIES = 1024
+_pred_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def _cache_key(prefix: str, text: str) -> str:
+    # blake2b: fast non-cryptographic digest (xxhash would need a new dep)
+    return prefix + hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def _cache_get(key: str):
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        if key in _pred_cache:
+            _pred_cache.move_to_end(key)
+            _cache_hits += 1
+            return _pred_cache[key]
+        _cache_misses += 1
+        return None
+
+
+def _cache_put(key: str, value) -> None:
+    with _cache_lock:
+        _pred_cache[key] = value
+        _pred_cache.move_to_end(key)
+        if len(_pred_cache) > _CACHE_MAX_ENTRIES:
+            _pred_cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    """Empty the prediction cache (e.g. after swapping the model)."""
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        _pred_cache.clear()
+        _cache_hits = 0
+        _cache_misses = 0
+
+
+def cache_stats() -> dict:
+    """Return prediction-cache occupancy and hit statistics."""
+    with _cache_lock:
+        return {
+            "entries": len(_pred_cache),
+            "max_entries": _CACHE_MAX_ENTRIES,
+            "hits": _cache_hits,
+            "misses": _cache_misses,
+        }
+
+
+def _maybe_compile(pt_model):
+    """
+    torch.compile the eager model when TORCH_COMPILE=1.
+
+    reduce-overhead fuses transformer layers and strips Python dispatch —
+    typically 20-40% over eager at inference. dynamic=True because unpadded
+    single-text inputs make sequence lengths variable, which would otherwise
+    recompile per new shape. Mutually exclusive with TORCH_JIT; the
+    preload_model warmup forward triggers compilation off the request path.
+    """
+    if not TORCH_COMPILE or TORCH_JIT or not hasattr(torch, "compile"):
+        return pt_model
+    if not isinstance(pt_model, torch.nn.Module):
+        return pt_model
+    print("   ⚡ Compiling model with torch.compile (reduce-overhead)")
+    return torch.compile(pt_model, mode="reduce-overhead", dynamic=True)
+
+
+class _TracedClassifier:
+    """Present a TorchScript trace behind the HF `.logits` output interface."""
+
+    def __init__(self, traced):
+        self._traced = traced
+
+    def __call__(self, input_ids, attention_mask, **_):
+        return SimpleNamespace(logits=self._traced(input_ids, attention_mask)[0])
+
+
+def _maybe_jit_trace(pt_model, tok):
+    """
+    Trace, freeze, and optimize the eager model when TORCH_JIT=1.
+
+    Freezing inlines weights as constants and optimize_for_inference folds
+    layernorm/gelu patterns, cutting Python dispatch overhead per forward.
+    A warmup call triggers TorchScript's profiling-JIT specialization up
+    front instead of on the first request.
+    """
+    if not TORCH_JIT or not isinstance(pt_model, torch.nn.Module):
+        return pt_model
+    try:
+        example = tok(
+            "TorchScript tracing example input.",
+            return_tensors="pt",
+            truncation=True,
+            max_length=128,
+            padding="max_length",
+        )
+        example = {k: v.to(device) for k, v in example.items()}
+        pt_model.config.return_dict = False  # tuple output traces cleanly
+        with torch.no_grad():
+            traced = torch.jit.trace(
+                pt_model, (example["input_ids"], example["attention_mask"])
+            )
+            traced = torch.jit.optimize_for_inference(torch.jit.freeze(traced.eval()))
+            traced(example["input_ids"], example["attention_mask"])  # warmup
+        print("   ⚡ TorchScript trace+freeze enabled")
+        return _TracedClassifier(traced)
+    except Exception as e:
+        pt_model.config.return_dict = True
+        print(f"   ⚠️ TorchScript tracing failed ({e}), using eager model")
+        return pt_model
+
 
 def _load_model():
     """Lazy load model and tokenizer on first use."""
@@ -51,108 +185,226 @@ def _load_model():
         )
     
     from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    
+
     print(f"📝 Loading Speaking Model from {MODEL_DIR}...")
-    _tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
-    _model = AutoModelForSequenceClassification.from_pretrained(MODEL_DIR).to(device)
-    _model.eval()
+    # use_fast: the Rust tokenizer is 5-10x quicker than the Python one
+    _tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR, use_fast=True)
+    if not _tokenizer.is_fast:
+        print("   ⚠️ Slow tokenizer in use — install `tokenizers` for the fast path")
+
+    # Prefer an ONNX Runtime export when USE_ORT=1 — same .logits interface,
+    # ~2x lower latency from graph fusion. Fall back to eager PyTorch.
+    _model = None
+    if USE_ORT:
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+
+            onnx_dir = f"{MODEL_DIR}-onnx"
+            if os.path.exists(onnx_dir):
+                # export_onnx.py leaves model.onnx and model.int8.onnx side
+                # by side; optimum refuses a multi-graph directory unless the
+                # file is named. Prefer the INT8 graph when present.
+                file_name = "model.int8.onnx"
+                if not os.path.exists(os.path.join(onnx_dir, file_name)):
+                    file_name = "model.onnx"
+                print(f"   📦 Using ONNX Runtime model from {onnx_dir} ({file_name})")
+                _model = ORTModelForSequenceClassification.from_pretrained(
+                    onnx_dir, file_name=file_name
+                )
+            else:
+                print(f"   📦 Exporting {MODEL_DIR} to ONNX (one-time)...")
+                _model = ORTModelForSequenceClassification.from_pretrained(
+                    MODEL_DIR, export=True
+                )
+        except Exception as e:
+            print(f"   ⚠️ ONNX Runtime unavailable ({e}), using PyTorch")
+
+    if _model is None:
+        _model = AutoModelForSequenceClassification.from_pretrained(MODEL_DIR).to(device)
+        _model.eval()
+        if QUANTIZE == "int8" and device.type == "cpu":
+            # INT8 Linear weights: FBGEMM int8 matmuls, ~2x CPU latency
+            if "fbgemm" in torch.backends.quantized.supported_engines:
+                torch.backends.quantized.engine = "fbgemm"
+            print("   ⚡ Applying INT8 dynamic quantization (CPU)")
+            _model = torch.quantization.quantize_dynamic(
+                _model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        _model = _maybe_jit_trace(_maybe_compile(_model), _tokenizer)
     print(f"   ✅ Model loaded successfully on {device}")
-    
+
     return _model, _tokenizer
 
 
-def predict_cefr_and_band(text: str) -> tuple[str, float]:
+def preload_model() -> None:
     """
-    Predict CEFR level and approximate IELTS Speaking band.
-    
-    Args:
-        text: The speaking transcript to score
-        
-    Returns:
-        Tuple of (cefr_level, ielts_band)
+    Load the model and run one warmup forward (removes cold-start latency).
+
+    The warmup triggers cuDNN autotune / TorchScript specialization so the
+    first real request doesn't pay for it.
     """
     model, tokenizer = _load_model()
-    
     enc = tokenizer(
-        text,
+        "warmup",
         return_tensors="pt",
         truncation=True,
         max_length=128,
         padding="max_length",
     ).to(device)
+    with torch.inference_mode():
+        model(**enc)
+    if device.type == "cuda":
+        torch.cuda.synchronize()
 
-    with torch.no_grad():
+
+def _run_speaking(text: str) -> torch.Tensor:
+    """
+    Tokenize and run the model exactly once, returning the logits row.
+
+    Both predict_cefr_and_band and get_cefr_probabilities derive their
+    answers from this single forward, so score_speaking with
+    include_probabilities=True no longer runs the model twice.
+    """
+    key = _cache_key("logits:", text)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    model, tokenizer = _load_model()
+
+    # padding=False: batch size is 1, so padding short transcripts out to
+    # 128 tokens only inflates the O(n^2) attention cost. max_length stays
+    # as a truncation cap. On GPU, round up to a multiple of 8 so FP16
+    # matmuls stay on the tensor-core fast path.
+    enc = tokenizer(
+        text,
+        return_tensors="pt",
+        truncation=True,
+        max_length=128,
+        padding="longest" if device.type == "cuda" else False,
+        pad_to_multiple_of=8 if device.type == "cuda" else None,
+    ).to(device)
+
+    # inference_mode skips autograd bookkeeping entirely (cheaper than
+    # no_grad), and autocast runs the forward in FP16 on GPU
+    with torch.inference_mode(), torch.autocast(
+        device_type=device.type, dtype=torch.float16, enabled=device.type == "cuda"
+    ):
         outputs = model(**enc)
-        logits = outputs.logits.detach().cpu().numpy()
-        pred_id = int(np.argmax(logits, axis=-1)[0])
+        logits = outputs.logits[0].detach()
 
-    cefr = ID2LABEL[pred_id]
-    band = CEFR_TO_IELTS.get(cefr, 0.0)
-    return cefr, band
+    _cache_put(key, logits)
+    return logits
 
 
-def get_cefr_probabilities(text: str) -> dict:
+def predict_cefr_and_band(text: str) -> tuple[str, float]:
     """
-    Get probability distribution over CEFR levels.
-    
+    Predict CEFR level and approximate IELTS Speaking band.
+
     Args:
-        text: The speaking transcript
-        
+        text: The speaking transcript to score
+
     Returns:
-        Dictionary mapping CEFR levels to probabilities
+        Tuple of (cefr_level, ielts_band)
+    """
+    logits = _run_speaking(text)
+    pred_id = int(torch.argmax(logits))
+    return ID2LABEL[pred_id], CEFR_BAND_BY_ID[pred_id]
+
+
+def predict_cefr_and_band_batch(texts: list) -> list:
+    """
+    Predict CEFR levels and bands for a batch of transcripts in one forward.
+
+    Batching amortizes tokenizer and kernel-launch overhead; padding is to
+    the longest transcript in the batch.
+
+    Args:
+        texts: List of speaking transcripts to score
+
+    Returns:
+        List of (cefr_level, ielts_band) tuples, aligned with input
     """
     model, tokenizer = _load_model()
-    
+
     enc = tokenizer(
-        text,
+        texts,
         return_tensors="pt",
         truncation=True,
         max_length=128,
-        padding="max_length",
+        padding=True,
+        # FP16 tensor cores need multiple-of-8 sequence lengths; no-op on CPU
+        pad_to_multiple_of=8 if device.type == "cuda" else None,
     ).to(device)
 
-    with torch.no_grad():
+    with torch.inference_mode(), torch.autocast(
+        device_type=device.type, dtype=torch.float16, enabled=device.type == "cuda"
+    ):
         outputs = model(**enc)
-        logits = outputs.logits.detach().cpu().numpy()[0]
-        # Apply softmax
-        exp_logits = np.exp(logits - np.max(logits))
-        probs = exp_logits / exp_logits.sum()
+        # argmax on-device, then one transfer of N ints instead of N*6 logits
+        pred_ids = torch.argmax(outputs.logits, dim=-1).cpu().tolist()
 
-    return {CEFR_LABELS[i]: float(probs[i]) for i in range(len(CEFR_LABELS))}
+    return [(ID2LABEL[pred_id], CEFR_BAND_BY_ID[pred_id]) for pred_id in pred_ids]
 
 
-def build_speaking_feedback(cefr: str, band: float) -> dict:
+def get_cefr_probabilities(text: str) -> dict:
     """
-    Generate feedback based on CEFR level and band.
+    Get probability distribution over CEFR levels.
     
     Args:
-        cefr: The predicted CEFR level
-        band: The approximate IELTS band
+        text: The speaking transcript
         
     Returns:
-        Dictionary with feedback for 4 Speaking criteria
+        Dictionary mapping CEFR levels to probabilities
     """
-    if band < 5.0:
-        return {
+    logits = _run_speaking(text)
+    # Softmax on-device, then a single D2H copy
+    probs = torch.softmax(logits, dim=-1).cpu().numpy()
+    return {CEFR_LABELS[i]: float(probs[i]) for i in range(len(CEFR_LABELS))}
+
+
+# Feedback tables precomputed at import: band bucket -> frozen dict, looked
+# up with a single bisect instead of a comparison chain plus a fresh dict
+# literal per call. MappingProxyType keeps callers from mutating the shared
+# dicts.
+_FEEDBACK_CUTOFFS = (5.0, 6.5)
+_FEEDBACKS = tuple(
+    MappingProxyType(fb)
+    for fb in (
+        {
             "fluency_coherence": "Tốc độ nói còn chậm với nhiều lần dừng. Hãy luyện nói liên tục hơn về các chủ đề quen thuộc.",
             "vocabulary": "Vốn từ còn hạn chế. Cần học thêm các cụm diễn đạt hàng ngày và từ vựng theo chủ đề.",
             "grammar": "Còn nhiều lỗi ngữ pháp cơ bản. Tập trung luyện các thì hiện tại, quá khứ và tương lai đơn.",
             "pronunciation": "Phát âm có thể gây khó hiểu cho người nghe. Luyện tập phát âm từng âm và trọng âm từ."
-        }
-    elif band < 6.5:
-        return {
+        },
+        {
             "fluency_coherence": "Bạn có thể duy trì bài nói về chủ đề quen thuộc với một chút do dự. Sử dụng thêm các từ nối.",
             "vocabulary": "Vốn từ tốt cho các chủ đề quen thuộc. Mở rộng thêm các cụm diễn đạt và collocations.",
             "grammar": "Kiểm soát tốt các cấu trúc đơn giản. Luyện thêm câu phức và câu điều kiện.",
             "pronunciation": "Phát âm khá rõ ràng. Cần cải thiện ngữ điệu và cách nối âm."
-        }
-    else:
-        return {
+        },
+        {
             "fluency_coherence": "Bạn nói trôi chảy, chỉ thỉnh thoảng do dự. Sử dụng tuyệt vời các từ nối.",
             "vocabulary": "Vốn từ phong phú với việc sử dụng tốt thành ngữ và collocations.",
             "grammar": "Kiểm soát nhất quán các cấu trúc phức tạp, chỉ thỉnh thoảng có lỗi nhỏ.",
             "pronunciation": "Phát âm rõ ràng, tự nhiên với việc kiểm soát tốt trọng âm và ngữ điệu."
-        }
+        },
+    )
+)
+
+
+def build_speaking_feedback(cefr: str, band: float) -> dict:
+    """
+    Generate feedback based on CEFR level and band.
+
+    Args:
+        cefr: The predicted CEFR level
+        band: The approximate IELTS band
+
+    Returns:
+        Dictionary with feedback for 4 Speaking criteria
+    """
+    return _FEEDBACKS[bisect_right(_FEEDBACK_CUTOFFS, band)]
 
 
 def score_speaking(text: str, include_probabilities: bool = False) -> dict:
@@ -166,18 +418,25 @@ def score_speaking(text: str, include_probabilities: bool = False) -> dict:
     Returns:
         Dictionary with cefr_level, approx_ielts_band, feedback, and optionally probabilities
     """
-    cefr, band = predict_cefr_and_band(text)
+    # One forward pass feeds both the prediction and the probabilities
+    logits = _run_speaking(text)
+    pred_id = int(torch.argmax(logits))
+    cefr = ID2LABEL[pred_id]
+    band = CEFR_BAND_BY_ID[pred_id]
     feedback = build_speaking_feedback(cefr, band)
-    
+
     result = {
         "cefr_level": cefr,
         "approx_ielts_band": band,
         "feedback": feedback
     }
-    
+
     if include_probabilities:
-        result["cefr_probabilities"] = get_cefr_probabilities(text)
-    
+        probs = torch.softmax(logits, dim=-1).cpu().numpy()
+        result["cefr_probabilities"] = {
+            CEFR_LABELS[i]: float(probs[i]) for i in range(len(CEFR_LABELS))
+        }
+
     return result
 
 
@@ -13,7 +13,10 @@ Best Practices Applied:
 - Configurable model size (tiny, base, small, medium, large)
 """
 
+import io
 import os
+import shutil
+import subprocess
 import tempfile
 import logging
 from pathlib import Path
@@ -24,6 +27,15 @@ import whisper
 import torch
 import numpy as np
 
+# faster-whisper (CTranslate2) runs the same checkpoints with INT8 weights
+# at roughly 4x the speed of openai-whisper on CPU; fall back when missing
+try:
+    from faster_whisper import WhisperModel as FasterWhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FasterWhisperModel = None
+    FASTER_WHISPER_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +46,16 @@ SUPPORTED_AUDIO_FORMATS = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm", ".m
 MAX_AUDIO_DURATION_SECONDS = 300  # 5 minutes max
 SAMPLE_RATE = 16000  # Whisper expects 16kHz audio
 
+# Greedy decoding: beam search costs ~5x decoder time for negligible WER
+# gain on short speaking clips, and conditioning on previous text mostly
+# invites repetition loops on disfluent speech. Bump beam_size back up here
+# if a higher-quality mode is ever needed.
+TRANSCRIBE_OPTIONS = {
+    "beam_size": 1,
+    "condition_on_previous_text": False,
+    "temperature": 0.0,
+}
+
 # ======================== SINGLETON MODEL LOADER ========================
 class WhisperModelManager:
     """
@@ -41,27 +63,39 @@ class WhisperModelManager:
     Ensures model is loaded only once and reused across requests.
     """
     _instance: Optional["WhisperModelManager"] = None
-    _model: Optional[whisper.Whisper] = None
+    _model = None
     _model_size: str = WHISPER_MODEL_SIZE
-    
+    _backend: str = "faster-whisper" if FASTER_WHISPER_AVAILABLE else "openai-whisper"
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
-    
+
     @property
-    def model(self) -> whisper.Whisper:
+    def model(self):
         if self._model is None:
             self._load_model()
         return self._model
-    
+
     def _load_model(self) -> None:
         """Load Whisper model with optimal device selection."""
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"🎤 Loading Whisper model '{self._model_size}' on {device}...")
-        
+        logger.info(
+            f"🎤 Loading Whisper model '{self._model_size}' "
+            f"({self._backend}) on {device}..."
+        )
+
         try:
-            self._model = whisper.load_model(self._model_size, device=device)
+            if self._backend == "faster-whisper":
+                # INT8 weights: 4x smaller and much faster decoding; keep
+                # FP16 activations on GPU for accuracy
+                compute_type = "int8_float16" if device == "cuda" else "int8"
+                self._model = FasterWhisperModel(
+                    self._model_size, device=device, compute_type=compute_type
+                )
+            else:
+                self._model = whisper.load_model(self._model_size, device=device)
             logger.info(f"✅ Whisper model loaded successfully!")
         except Exception as e:
             logger.error(f"❌ Failed to load Whisper model: {e}")
@@ -80,11 +114,15 @@ class WhisperModelManager:
     @property
     def device(self) -> str:
         return "cuda" if torch.cuda.is_available() else "cpu"
-    
+
     @property
     def model_size(self) -> str:
         return self._model_size
 
+    @property
+    def backend(self) -> str:
+        return self._backend
+
 
 # Global instance
 whisper_manager = WhisperModelManager()
@@ -144,6 +182,26 @@ def get_audio_duration(file_path: str) -> float:
     Returns:
         Duration in seconds
     """
+    # Header-only reads first: soundfile covers WAV/FLAC/OGG and mutagen
+    # covers MP3/M4A in microseconds, versus a full ffmpeg decode+resample
+    # just to divide a sample count by the rate.
+    try:
+        import soundfile
+
+        return float(soundfile.info(file_path).duration)
+    except Exception:
+        pass
+
+    try:
+        import mutagen
+
+        media = mutagen.File(file_path)
+        if media is not None and media.info.length:
+            return float(media.info.length)
+    except Exception:
+        pass
+
+    # Last resort: full decode (also the path when neither lib is installed)
     try:
         audio = whisper.load_audio(file_path)
         duration = len(audio) / SAMPLE_RATE
@@ -153,6 +211,31 @@ def get_audio_duration(file_path: str) -> float:
         return 0.0
 
 
+def _decode_audio_bytes(audio_bytes: bytes) -> np.ndarray:
+    """
+    Decode audio bytes to 16 kHz mono float32 via an ffmpeg stdin pipe.
+
+    Skips the temp-file round-trip entirely for the common small-clip case:
+    bytes go straight through ffmpeg's stdin/stdout, never touching disk.
+    Raises on formats ffmpeg cannot read from a pipe (e.g. mp4 containers
+    with the index at the end) — callers fall back to the temp-file path.
+    """
+    cmd = [
+        "ffmpeg",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        "-loglevel", "error",
+        "pipe:1",
+    ]
+    proc = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True)
+    if not proc.stdout:
+        raise RuntimeError("ffmpeg produced no output")
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+
+
 # ======================== TEMP FILE MANAGEMENT ========================
 @contextmanager
 def temp_audio_file(content: bytes, suffix: str = ".wav"):
@@ -237,34 +320,80 @@ def transcribe_audio(
     """
     # Validate audio file
     validate_audio_file(file_path)
-    
-    # Check duration
-    duration = get_audio_duration(file_path)
+
+    # Decode once (ffmpeg -> 16 kHz mono float32). The duration falls out of
+    # the sample count, and both backends accept the array directly — the old
+    # flow ran a full ffmpeg decode in get_audio_duration and then a second
+    # one inside model.transcribe.
+    try:
+        audio = whisper.load_audio(file_path)
+    except Exception as e:
+        logger.error(f"❌ Could not decode audio: {e}")
+        raise RuntimeError(f"Transcription failed: {e}")
+
+    return _transcribe_array(
+        audio, language=language, task=task, include_segments=include_segments
+    )
+
+
+def _transcribe_array(
+    audio: np.ndarray,
+    language: str = "en",
+    task: Literal["transcribe", "translate"] = "transcribe",
+    include_segments: bool = False
+) -> TranscriptionResult:
+    """Transcribe decoded 16 kHz mono float32 audio (shared by all paths)."""
+    duration = len(audio) / SAMPLE_RATE
     if duration > MAX_AUDIO_DURATION_SECONDS:
         raise AudioValidationError(
             f"Audio too long: {duration:.1f}s. "
             f"Maximum duration: {MAX_AUDIO_DURATION_SECONDS}s"
         )
-    
+
     logger.info(f"🎙️ Transcribing audio ({duration:.1f}s)...")
-    
+
     # Get model
     model = whisper_manager.model
-    
+
     # Transcribe
     try:
-        result = model.transcribe(
-            file_path,
-            language=language,
-            task=task,
-            verbose=False,
-            fp16=torch.cuda.is_available(),  # Use FP16 on GPU
-        )
-        
-        text = result.get("text", "").strip()
-        detected_language = result.get("language", language)
-        segments = result.get("segments", []) if include_segments else []
-        
+        if whisper_manager.backend == "faster-whisper":
+            segment_iter, info = model.transcribe(
+                audio,
+                language=language,
+                task=task,
+                best_of=1,  # openai-whisper forbids beam_size + best_of together
+                **TRANSCRIBE_OPTIONS,
+            )
+            # The generator decodes lazily; materialize it to build the text.
+            # Segments are normalized to the openai-whisper dict shape so
+            # TranscriptionResult.to_dict works for both backends.
+            all_segments = [
+                {
+                    "start": seg.start,
+                    "end": seg.end,
+                    "text": seg.text,
+                    "no_speech_prob": seg.no_speech_prob,
+                }
+                for seg in segment_iter
+            ]
+            text = "".join(seg["text"] for seg in all_segments).strip()
+            detected_language = info.language or language
+            segments = all_segments if include_segments else []
+        else:
+            result = model.transcribe(
+                audio,
+                language=language,
+                task=task,
+                verbose=False,
+                fp16=torch.cuda.is_available(),  # Use FP16 on GPU
+                **TRANSCRIBE_OPTIONS,
+            )
+
+            text = result.get("text", "").strip()
+            detected_language = result.get("language", language)
+            segments = result.get("segments", []) if include_segments else []
+
         # Calculate average confidence from segments
         confidence = None
         if segments:
@@ -287,44 +416,105 @@ def transcribe_audio(
         raise RuntimeError(f"Transcription failed: {e}")
 
 
-async def transcribe_audio_bytes(
-    audio_bytes: bytes,
+def transcribe_audio_file(
+    fileobj,
     filename: str,
     language: str = "en",
     task: Literal["transcribe", "translate"] = "transcribe",
     include_segments: bool = False
 ) -> TranscriptionResult:
     """
-    Async version: Transcribe audio from bytes.
-    
+    Transcribe audio from an open binary file object (e.g. UploadFile.file).
+
+    Streams the file to a temp path in 1MB chunks instead of buffering the
+    whole upload as a bytes object — for 25MB uploads this avoids doubling
+    peak memory on top of the framework's own buffer.
+
     Args:
-        audio_bytes: Audio file content as bytes
+        fileobj: Readable binary file object positioned at the start
         filename: Original filename (for extension)
         language: Language code
         task: 'transcribe' or 'translate'
         include_segments: Whether to include segments
-        
+
     Returns:
         TranscriptionResult object
     """
     # Get file extension from filename
     suffix = Path(filename).suffix.lower() or ".wav"
-    
+
     # Validate extension
     if suffix not in SUPPORTED_AUDIO_FORMATS:
         raise AudioValidationError(
             f"Unsupported audio format: {suffix}. "
             f"Supported: {', '.join(SUPPORTED_AUDIO_FORMATS)}"
         )
-    
-    # Use temp file for processing
-    with temp_audio_file(audio_bytes, suffix=suffix) as temp_path:
+
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            shutil.copyfileobj(fileobj, temp_file, length=1024 * 1024)
+            temp_path = temp_file.name
         return transcribe_audio(
             temp_path,
             language=language,
             task=task,
             include_segments=include_segments
         )
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.unlink(temp_path)
+            except Exception as e:
+                logger.warning(f"Failed to delete temp file {temp_path}: {e}")
+
+
+async def transcribe_audio_bytes(
+    audio_bytes: bytes,
+    filename: str,
+    language: str = "en",
+    task: Literal["transcribe", "translate"] = "transcribe",
+    include_segments: bool = False
+) -> TranscriptionResult:
+    """
+    Async version: Transcribe audio from bytes.
+
+    Tries an in-memory ffmpeg pipe decode first — typical clips never touch
+    disk. Falls back to the temp-file path for formats ffmpeg cannot read
+    from stdin.
+
+    Args:
+        audio_bytes: Audio file content as bytes
+        filename: Original filename (for extension)
+        language: Language code
+        task: 'transcribe' or 'translate'
+        include_segments: Whether to include segments
+
+    Returns:
+        TranscriptionResult object
+    """
+    suffix = Path(filename).suffix.lower() or ".wav"
+    if suffix not in SUPPORTED_AUDIO_FORMATS:
+        raise AudioValidationError(
+            f"Unsupported audio format: {suffix}. "
+            f"Supported: {', '.join(SUPPORTED_AUDIO_FORMATS)}"
+        )
+
+    try:
+        audio = _decode_audio_bytes(audio_bytes)
+    except Exception as e:
+        logger.info(f"Pipe decode unavailable for {suffix} ({e}), using temp file")
+        return transcribe_audio_file(
+            io.BytesIO(audio_bytes),
+            filename,
+            language=language,
+            task=task,
+            include_segments=include_segments
+        )
+
+    return _transcribe_array(
+        audio, language=language, task=task, include_segments=include_segments
+    )
 
 
 # ======================== UTILITY FUNCTIONS ========================
@@ -332,6 +522,7 @@ def get_whisper_info() -> dict:
     """Get information about current Whisper configuration."""
     return {
         "model_size": whisper_manager.model_size,
+        "backend": whisper_manager.backend,
         "device": whisper_manager.device,
         "supported_formats": list(SUPPORTED_AUDIO_FORMATS),
         "max_duration_seconds": MAX_AUDIO_DURATION_SECONDS,